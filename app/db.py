@@ -1,22 +1,87 @@
 import os
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, inspect, MetaData
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/rooms_booking.db"
+
+# Connections are pooled and reused across requests instead of reopening
+# the database file each time. The endpoint threadpool is sized from these.
+POOL_SIZE = 20
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 30  # seconds
+POOL_RECYCLE = 3600  # seconds
+
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=POOL_RECYCLE,
+)
+
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, _):
+    """
+    Tune each new SQLite connection: WAL lets readers run alongside the
+    single writer, and NORMAL sync is safe under WAL while skipping the
+    fsync on every commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# Objects stay loaded after commit, so returning a just-written row doesn't
+# cost another SELECT
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 metadata = MetaData()
 
 
+def add_booking_slot_ids(conn):
+    """
+    Upgrade a bookings table created before bookings had a slot_id column.
+    create_all doesn't alter existing tables, and SQLite can only add a NOT
+    NULL column and a unique constraint by rebuilding the table, so the old
+    rows are copied into a freshly created one with slot_id filled in.
+    """
+    columns = {column["name"] for column in inspect(conn).get_columns("bookings")}
+    if "slot_id" in columns:
+        return
+    conn.exec_driver_sql("ALTER TABLE bookings RENAME TO bookings_old")
+    # Indexes keep their names across the rename and would clash
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_bookings_id")
+    Base.metadata.tables["bookings"].create(conn)
+    # Hours since the epoch, the same value as app.models.booking.slot_id_for
+    conn.exec_driver_sql(
+        "INSERT INTO bookings "
+        "(id, room_id, user_id, start_time, end_time, slot_id, purpose) "
+        "SELECT id, room_id, user_id, start_time, end_time, "
+        "CAST(strftime('%s', start_time) AS INTEGER) / 3600, purpose "
+        "FROM bookings_old"
+    )
+    conn.exec_driver_sql("DROP TABLE bookings_old")
+
+
 def init_database():
     if not os.path.exists("./data"):
         os.makedirs("./data")
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if inspect(conn).has_table("bookings"):
+            add_booking_slot_ids(conn)
+        Base.metadata.create_all(bind=conn)
 
 
 def get_db():
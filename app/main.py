@@ -1,18 +1,28 @@
 from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.routers import auth, rooms, bookings
-from app.db import init_database
+from app.db import init_database, POOL_SIZE, MAX_OVERFLOW
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    "lifespan for initing database"
+    "lifespan for initing database and sizing the endpoint threadpool"
     init_database()
+    # Sync endpoints run in AnyIO's threadpool. Threads beyond the number of
+    # pooled connections would only block inside the pool checkout, so let
+    # extra requests wait on the event loop instead.
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = POOL_SIZE + MAX_OVERFLOW
     yield
 
 
 app = FastAPI(
     lifespan=lifespan,
+    # orjson serializes the response payloads, datetimes included, in native
+    # code instead of going through the stdlib json module
+    default_response_class=ORJSONResponse,
     title="Room booker",
     description="Simple room booker based on FastAPI.",
     version="0.0.1",
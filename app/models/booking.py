@@ -1,7 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import datetime, timedelta
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship, validates
 from app.db import Base
 
+SLOT_EPOCH = datetime(1970, 1, 1)
+SLOT_LENGTH = timedelta(hours=1)
+
+
+def slot_id_for(start_time: datetime) -> int:
+    """Return the number of whole hours between the epoch and start_time."""
+    return (start_time.replace(tzinfo=None) - SLOT_EPOCH) // SLOT_LENGTH
+
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -11,7 +20,21 @@ class Booking(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
+    # Hour slot of start_time, kept in sync by sync_slot_id. Bookings fill
+    # exactly one slot, so overlap checks become an integer equality.
+    slot_id = Column(Integer, nullable=False)
     purpose = Column(String, nullable=True)
 
-    room = relationship("Room", back_populates="bookings")
-    user = relationship("User", back_populates="bookings")
+    # Nothing reads these on the hot paths; callers that need them must opt
+    # in with a loader option instead of lazy loading per row
+    room = relationship("Room", back_populates="bookings", lazy="raise")
+    user = relationship("User", back_populates="bookings", lazy="raise")
+
+    # A room can't hold two bookings in the same slot; the backing index
+    # also serves the per-room slot range scans.
+    __table_args__ = (UniqueConstraint("room_id", "slot_id", name="uq_room_slot"),)
+
+    @validates("start_time")
+    def sync_slot_id(self, _, value):
+        self.slot_id = slot_id_for(value)
+        return value
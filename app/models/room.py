@@ -8,9 +8,11 @@ class Room(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
-    capacity = Column(Integer, nullable=False)
+    # Lets find_optimal_room walk rooms smallest first and stop at the first
+    # free one instead of sorting every room that fits
+    capacity = Column(Integer, nullable=False, index=True)
     location = Column(String, nullable=True)
 
     bookings = relationship(
-        "Booking", back_populates="room", cascade="all, delete-orphan"
+        "Booking", back_populates="room", cascade="all, delete-orphan", lazy="raise"
     )
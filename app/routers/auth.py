@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db import get_db
 from app.models.user import User
@@ -20,14 +21,14 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
     """
-    db_user = db.query(User).filter(User.username == user.username).first()
+    db_user = db.scalars(select(User).where(User.username == user.username)).first()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
 
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = db.scalars(select(User).where(User.email == user.email)).first()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
@@ -39,7 +40,6 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
@@ -50,7 +50,7 @@ def login(
     """
     Login to obtain a JWT access token.
     """
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = db.scalars(select(User).where(User.username == form_data.username)).first()
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
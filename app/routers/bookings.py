@@ -1,9 +1,12 @@
 from typing import List, Dict
 from fastapi import APIRouter, Depends, HTTPException, status
 from datetime import datetime, timedelta, date
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db import get_db
-from app.models.booking import Booking
+from app.models.booking import Booking, slot_id_for, SLOT_LENGTH
 from app.models.room import Room
 from app.schemas.booking import (
     BookingCreate,
@@ -12,6 +15,13 @@ from app.schemas.booking import (
     BookingOptimizeRequest,
 )
 from app.utils.auth import get_current_user
+from app.utils.room_cache import get_room_capacity
+from app.utils.slot_cache import (
+    get_cached_slots,
+    slot_cache_generation,
+    cache_slots,
+    clear_slot_cache,
+)
 from app.utils.scheduler import find_optimal_room
 
 router = APIRouter(
@@ -19,6 +29,69 @@ router = APIRouter(
     tags=["bookings"],
 )
 
+# Window offered by get_available_slots: 8 AM to 6 PM
+WORKDAY_START = timedelta(hours=8)
+WORKDAY_LENGTH = timedelta(hours=10)
+WORKDAY_MINUTES = WORKDAY_LENGTH // timedelta(minutes=1)
+SLOT_MINUTES = SLOT_LENGTH // timedelta(minutes=1)
+
+BOOKING_RESPONSE_COLUMNS = (
+    Booking.id,
+    Booking.room_id,
+    Booking.user_id,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.purpose,
+)
+
+
+# Inserting with ON CONFLICT DO NOTHING RETURNING takes the slot in one
+# statement: a row that hits the (room_id, slot_id) constraint is skipped
+# and simply missing from the result instead of failing the transaction.
+_insert_bookings = (
+    insert(Booking)
+    .on_conflict_do_nothing(index_elements=["room_id", "slot_id"])
+    .returning(Booking)
+)
+
+
+def booking_row(room_id: int, user_id: int, start_time: datetime, purpose: str):
+    """Build the column values for a one-hour booking starting at start_time."""
+    return {
+        "room_id": room_id,
+        "user_id": user_id,
+        "start_time": start_time,
+        "end_time": start_time + SLOT_LENGTH,
+        # Core inserts bypass Booking.sync_slot_id, so set the slot here
+        "slot_id": slot_id_for(start_time),
+        "purpose": purpose,
+    }
+
+
+def insert_bookings(db: Session, rows: List[dict]):
+    """
+    Insert bookings and commit them, or insert none of them if any slot is
+    already taken. The returned bookings are in no particular order.
+    """
+    try:
+        db_bookings = db.scalars(_insert_bookings, rows).all()
+    except IntegrityError:
+        # ON CONFLICT only covers the slot constraint; the room foreign key
+        # still fails if the room was deleted after the cached lookup
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
+        )
+    if len(db_bookings) < len(rows):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Room is already booked for this time slot",
+        )
+    db.commit()
+    clear_slot_cache()
+    return db_bookings
+
 
 @router.post(
     "/",
@@ -45,54 +118,100 @@ def create_booking(
     """
 
     # Check if room exists and capacity is sufficient
-    room = db.query(Room).filter(Room.id == booking.room_id).first()
-    if not room:
+    capacity = get_room_capacity(db, booking.room_id)
+    if capacity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
         )
-    if room.capacity < booking.required_capacity:
+    if capacity < booking.required_capacity:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Room capacity insufficient"
         )
 
     # Validate start_time is at the start of an hour
-    if booking.start_time.minute != 0 or booking.start_time.second != 0:
+    start = booking.start_time
+    if start.minute | start.second | start.microsecond:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Start time must be at the start of an hour",
         )
 
-    # Calculate end_time
-    end_time = booking.start_time + timedelta(hours=1)
+    # Create booking. There is no separate overlap query: the insert skips
+    # a taken slot and returns nothing.
+    row = booking_row(
+        booking.room_id, current_user["id"], booking.start_time, booking.purpose
+    )
+    return insert_bookings(db, [row])[0]
 
-    # Check for overlapping bookings
-    overlapping = (
-        db.query(Booking)
-        .filter(
-            Booking.room_id == booking.room_id,
-            Booking.start_time < end_time,
-            Booking.end_time > booking.start_time,
-        )
-        .first()
+
+@router.post(
+    "/bulk",
+    response_model=List[BookingResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many bookings",
+    description="Create several one-hour bookings in a single transaction. Requires authentication.",
+)
+def bulk_create_bookings(
+    bookings: List[BookingCreate],
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Create several one-hour bookings at once. Either all of them are created
+    or none is.
+    Requires authentication.
+
+    Each item takes the same fields as a single booking:
+    - **room_id**: ID of the room to book.
+    - **start_time**: Start time of the booking (must be at the start of an hour).
+    - **purpose**: Purpose of the booking.
+    - **required_capacity**: Required room capacity.
+
+    Returns the created bookings in request order.
+    """
+    if not bookings:
+        return []
+
+    room_ids = {booking.room_id for booking in bookings}
+
+    # Fetch every referenced room in one query
+    capacities = dict(
+        db.execute(select(Room.id, Room.capacity).where(Room.id.in_(room_ids))).all()
     )
-    if overlapping:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Room is already booked for this time slot",
+
+    # Conflicts with existing bookings are caught by the insert; only clashes
+    # inside the batch are checked here, to report them before touching the
+    # database.
+    rows = {}
+    for booking in bookings:
+        capacity = capacities.get(booking.room_id)
+        if capacity is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
+            )
+        if capacity < booking.required_capacity:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Room capacity insufficient",
+            )
+        row = booking_row(
+            booking.room_id, current_user["id"], booking.start_time, booking.purpose
         )
+        slot = (row["room_id"], row["slot_id"])
+        if slot in rows:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Room is already booked for this time slot",
+            )
+        rows[slot] = row
 
-    # Create booking
-    db_booking = Booking(
-        room_id=booking.room_id,
-        user_id=current_user["id"],
-        start_time=booking.start_time,
-        end_time=end_time,
-        purpose=booking.purpose,
-    )
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
-    return db_booking
+    # All rows go out in one multi-row INSERT, whose RETURNING order isn't
+    # guaranteed; put the bookings back in request order by their slot.
+    db_bookings = {
+        (db_booking.room_id, db_booking.slot_id): db_booking
+        for db_booking in insert_bookings(db, list(rows.values()))
+    }
+    return [db_bookings[slot] for slot in rows]
 
 
 @router.get(
@@ -114,7 +233,17 @@ def get_bookings(
 
     Returns a list of bookings with ID, room ID, user ID, start time, end time, and purpose.
     """
-    bookings = db.query(Booking).offset(skip).limit(limit).all()
+    # Select just the columns BookingResponse needs. Plain rows skip building
+    # ORM instances and registering them in the identity map, and can never
+    # trigger a lazy load of Booking.room or Booking.user.
+    bookings = (
+        db.execute(
+            select(*BOOKING_RESPONSE_COLUMNS)
+            .order_by(Booking.id)
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
     return bookings
 
 
@@ -135,7 +264,7 @@ def get_booking(
 
     Returns the booking details.
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.get(Booking, booking_id)
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
@@ -166,61 +295,71 @@ def update_booking(
 
     Returns the updated booking.
     """
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not db_booking:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
-        )
-
-    if db_booking.user_id != current_user["id"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this booking",
-        )
-
-    # Calculate new start_time and end_time
-    new_start_time = booking_update.start_time or db_booking.start_time
-    new_end_time = new_start_time + timedelta(hours=1)
+    values = booking_update.model_dump(exclude_unset=True)
+    # A null room or start time keeps the current one
+    for key in ("room_id", "start_time"):
+        if values.get(key) is None:
+            values.pop(key, None)
+
+    if "start_time" in values:
+        new_start_time = values["start_time"]
+        if new_start_time.minute | new_start_time.second | new_start_time.microsecond:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Start time must be at the start of an hour",
+            )
+        values["end_time"] = new_start_time + SLOT_LENGTH
+        # Core updates bypass Booking.sync_slot_id, so move the slot here
+        values["slot_id"] = slot_id_for(new_start_time)
 
-    # Validate new start_time
-    if new_start_time.minute != 0 or new_start_time.second != 0:
+    if "room_id" in values and get_room_capacity(db, values["room_id"]) is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Start time must be at the start of an hour",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
         )
 
-    # Check for overlapping bookings if room or time is updated
-    if booking_update.room_id or booking_update.start_time:
-        room_id = booking_update.room_id or db_booking.room_id
-        room = db.query(Room).filter(Room.id == room_id).first()
-        if not room:
+    # Apply the change in one UPDATE ... RETURNING, limited to the caller's
+    # own booking. OR IGNORE turns a clash with the (room_id, slot_id)
+    # constraint into an unchanged row, like the ON CONFLICT DO NOTHING
+    # insert, so every failure shows up as no row returned.
+    owned_booking = (Booking.id == booking_id, Booking.user_id == current_user["id"])
+    if values:
+        try:
+            db_booking = db.scalars(
+                update(Booking)
+                .prefix_with("OR IGNORE", dialect="sqlite")
+                .where(*owned_booking)
+                .values(**values)
+                .returning(Booking)
+            ).first()
+        except IntegrityError:
+            # OR IGNORE does not apply to the room foreign key
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
             )
-        overlapping = (
-            db.query(Booking)
-            .filter(
-                Booking.room_id == room_id,
-                Booking.id != booking_id,
-                Booking.start_time < new_end_time,
-                Booking.end_time > new_start_time,
+    else:
+        db_booking = db.scalars(select(Booking).where(*owned_booking)).first()
+
+    if db_booking is None:
+        db.rollback()
+        # Only a failed update pays for finding out why
+        user_id = db.scalar(select(Booking.user_id).where(Booking.id == booking_id))
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
             )
-            .first()
-        )
-        if overlapping:
+        if user_id != current_user["id"]:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Room is already booked for this time slot",
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to update this booking",
             )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Room is already booked for this time slot",
+        )
 
-    # Update booking
-    update_data = booking_update.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_booking, key, value)
-    db_booking.start_time = new_start_time
-    db_booking.end_time = new_end_time
     db.commit()
-    db.refresh(db_booking)
+    clear_slot_cache()
     return db_booking
 
 
@@ -241,7 +380,7 @@ def delete_booking(
 
     - **booking_id**: ID of the booking to delete.
     """
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    db_booking = db.get(Booking, booking_id)
     if not db_booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
@@ -255,6 +394,7 @@ def delete_booking(
 
     db.delete(db_booking)
     db.commit()
+    clear_slot_cache()
     return None
 
 
@@ -282,36 +422,25 @@ def optimize_booking(
     """
 
     # Validate start_time
-    if booking.start_time.minute != 0 or booking.start_time.second != 0:
+    start = booking.start_time
+    if start.minute | start.second | start.microsecond:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Start time must be at the start of an hour",
         )
 
-    # Calculate end_time
-    end_time = booking.start_time + timedelta(hours=1)
-
     # Find optimal room
-    optimal_room = find_optimal_room(
-        db, booking.start_time, end_time, booking.required_capacity
-    )
+    optimal_room = find_optimal_room(db, booking.start_time, booking.required_capacity)
     if not optimal_room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No suitable room available"
         )
 
     # Create booking
-    db_booking = Booking(
-        room_id=optimal_room.id,
-        user_id=current_user["id"],
-        start_time=booking.start_time,
-        end_time=end_time,
-        purpose=booking.purpose,
+    row = booking_row(
+        optimal_room.id, current_user["id"], booking.start_time, booking.purpose
     )
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
-    return db_booking
+    return insert_bookings(db, [row])[0]
 
 
 @router.get(
@@ -344,46 +473,56 @@ def get_available_slots(
         )
 
     # Check if room exists
-    room = db.query(Room).filter(Room.id == room_id).first()
-    if not room:
+    if get_room_capacity(db, room_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
         )
 
-    # Define the day's time range (8 AM to 6 PM)
-    day_start = datetime.combine(date, datetime.min.time()) + timedelta(hours=8)
-    day_end = day_start + timedelta(hours=10)  # 8 AM to 6 PM
+    cache_key = (room_id, date, duration)
+    slots = get_cached_slots(cache_key)
+    if slots is not None:
+        return slots
+    generation = slot_cache_generation()
 
-    # Get existing bookings for the room on the date
-    bookings = (
-        db.query(Booking)
-        .filter(
+    # Define the day's time range (8 AM to 6 PM)
+    day_start = datetime.combine(date, datetime.min.time()) + WORKDAY_START
+    day_end = day_start + WORKDAY_LENGTH
+
+    # Get the booked hour slots for the room on the date. Slot ids are
+    # integers on the (room_id, slot_id) index, so this is one range scan
+    # that returns a single column.
+    first_slot = slot_id_for(day_start)
+    booked_slots = db.scalars(
+        select(Booking.slot_id)
+        .where(
             Booking.room_id == room_id,
-            Booking.start_time >= day_start,
-            Booking.end_time <= day_end,
+            Booking.slot_id >= first_slot,
+            Booking.slot_id < slot_id_for(day_end),
         )
-        .order_by(Booking.start_time)
-        .all()
-    )
-
-    # Initialize slots
-    slots = []
-    current_time = day_start
+        .order_by(Booking.slot_id)
+    ).all()
+
+    # Sweep the sorted bookings once in whole minutes from day_start,
+    # collecting the start offsets of the free slots in each gap
+    free_offsets = []
+    gap_start = 0
+    for slot_id in booked_slots:
+        booking_start = (slot_id - first_slot) * SLOT_MINUTES
+        free_offsets.extend(range(gap_start, booking_start - duration + 1, duration))
+        gap_start = max(gap_start, booking_start + SLOT_MINUTES)
+    free_offsets.extend(range(gap_start, WORKDAY_MINUTES - duration + 1, duration))
+
+    # Build datetimes only for the slots that are returned
     duration_delta = timedelta(minutes=duration)
+    slots = []
+    for offset in free_offsets:
+        slot_start_time = day_start + timedelta(minutes=offset)
+        slots.append(
+            {
+                "start_time": slot_start_time,
+                "end_time": slot_start_time + duration_delta,
+            }
+        )
 
-    # Handle bookings and find gaps
-    for booking in bookings:
-        # Add slots before the current booking
-        while current_time + duration_delta <= booking.start_time:
-            slot_end = current_time + duration_delta
-            slots.append({"start_time": current_time, "end_time": slot_end})
-            current_time = slot_end
-        current_time = max(current_time, booking.end_time)
-
-    # Add slots after the last booking
-    while current_time + duration_delta <= day_end:
-        slot_end = current_time + duration_delta
-        slots.append({"start_time": current_time, "end_time": slot_end})
-        current_time = slot_end
-
+    cache_slots(cache_key, slots, generation)
     return slots
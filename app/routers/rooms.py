@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from app.db import get_db
 from app.models.room import Room
 from app.schemas.room import RoomCreate, RoomUpdate, RoomResponse
 from app.utils.auth import get_current_user
+from app.utils.room_cache import invalidate_room
+from app.utils.slot_cache import clear_slot_cache
 
 
 router = APIRouter(
@@ -23,10 +26,9 @@ def create_room(
     Create a new room.
     Requires authentication.
     """
-    db_room = Room(**room.dict())
+    db_room = Room(**room.model_dump())
     db.add(db_room)
     db.commit()
-    db.refresh(db_room)
     return db_room
 
 
@@ -35,7 +37,15 @@ def get_rooms(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """
     Retrieve a list of all rooms.
     """
-    rooms = db.query(Room).offset(skip).limit(limit).all()
+    # Plain column rows are enough for RoomResponse and skip building ORM
+    # instances for the whole page
+    rooms = (
+        db.execute(
+            select(Room.id, Room.name, Room.capacity, Room.location)
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
     return rooms
 
 
@@ -44,7 +54,7 @@ def get_room(room_id: int, db: Session = Depends(get_db)):
     """
     Retrieve a specific room by ID.
     """
-    room = db.query(Room).filter(Room.id == room_id).first()
+    room = db.get(Room, room_id)
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
@@ -63,18 +73,18 @@ def update_room(
     Update a room's details.
     Requires authentication.
     """
-    db_room = db.query(Room).filter(Room.id == room_id).first()
+    db_room = db.get(Room, room_id)
     if not db_room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
         )
 
-    update_data = room_update.dict(exclude_unset=True)
+    update_data = room_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_room, key, value)
 
     db.commit()
-    db.refresh(db_room)
+    invalidate_room(room_id)
     return db_room
 
 
@@ -88,7 +98,8 @@ def delete_room(
     Delete a room.
     Requires authentication.
     """
-    db_room = db.query(Room).filter(Room.id == room_id).first()
+    # The bookings are needed for the delete cascade, load them up front
+    db_room = db.get(Room, room_id, options=[selectinload(Room.bookings)])
     if not db_room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Room not found"
@@ -96,4 +107,6 @@ def delete_room(
 
     db.delete(db_room)
     db.commit()
+    invalidate_room(room_id)
+    clear_slot_cache()
     return None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime
 from typing import Optional
 from app.utils.validation_helpers import validate_start_time
@@ -9,7 +9,8 @@ class BookingBase(BaseModel):
     start_time: datetime
     purpose: Optional[str] = None
 
-    @validator("start_time")
+    @field_validator("start_time")
+    @classmethod
     def check_start_time(cls, value):
         return validate_start_time(value)
 
@@ -23,7 +24,8 @@ class BookingUpdate(BaseModel):
     start_time: Optional[datetime] = None
     purpose: Optional[str] = None
 
-    @validator("start_time")
+    @field_validator("start_time")
+    @classmethod
     def check_start_time(cls, value):
         return validate_start_time(value)
 
@@ -36,8 +38,7 @@ class BookingResponse(BaseModel):
     end_time: datetime
     purpose: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BookingOptimizeRequest(BaseModel):
@@ -45,5 +46,4 @@ class BookingOptimizeRequest(BaseModel):
     purpose: str
     required_capacity: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,20 +1,36 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+import jwt
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db import get_db
 from app.models.user import User
+from app.utils.ttl_cache import TTLCache
 
 # JWT configuration
 # Consistent key for encoding/decoding
 SECRET_KEY = "secure-secret-key-1234567890"
+# Encoded once here rather than by PyJWT on every encode/decode
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Verified tokens are cached briefly, so a client sending many requests
+# with the same token skips the JWT decode and the user lookup
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL = 60  # seconds
+current_user_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+
+# Password hashing. Each bcrypt round doubles the hashing cost; the login
+# and register endpoints are sync, so hashing runs in the threadpool rather
+# than blocking the event loop.
+BCRYPT_ROUNDS = 12
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
 
 # HTTP Bearer scheme for JWT token
 bearer_scheme = HTTPBearer(
@@ -38,7 +54,7 @@ def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -47,25 +63,39 @@ def get_current_user(
     db: Session = Depends(get_db),
 ):
     """Verify JWT token from Bearer header and return the current user."""
+    token = credentials.credentials
+    current_user = current_user_cache.get(token)
+    if current_user is not None:
+        return current_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    token = credentials.credentials
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(
+            token,
+            SECRET_KEY_BYTES,
+            algorithms=[ALGORITHM],
+            options={"require": ["exp"]},
+        )
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-    except JWTError as e:
+    except jwt.PyJWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Could not validate credentials: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.username == username).first()
+    user = db.scalars(select(User).where(User.username == username)).first()
     if user is None:
         raise credentials_exception
-    return {"id": user.id, "username": user.username}
+
+    current_user = {"id": user.id, "username": user.username}
+    # Never keep a token cached past its own expiry
+    ttl = min(TOKEN_CACHE_TTL, payload["exp"] - time.time())
+    current_user_cache.set(token, current_user, ttl=ttl)
+    return current_user
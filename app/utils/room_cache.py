@@ -0,0 +1,39 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.room import Room
+from app.utils.ttl_cache import TTLCache
+
+ROOM_CACHE_SIZE = 1024
+# Only this process's room updates invalidate the cache, so entries expire
+# quickly to bound how long a change made elsewhere goes unnoticed
+ROOM_CACHE_TTL = 5  # seconds
+
+# room_id -> capacity
+_capacities = TTLCache(maxsize=ROOM_CACHE_SIZE, ttl=ROOM_CACHE_TTL)
+
+
+def get_room_capacity(db: Session, room_id: int):
+    """
+    Return the capacity of a room, or None if the room doesn't exist.
+    Rooms rarely change, so capacities are kept in a short-lived in-process
+    cache and repeated bookings of a room skip the database.
+    """
+    capacity = _capacities.get(room_id)
+    if capacity is not None:
+        return capacity
+
+    generation = _capacities.generation
+    capacity = db.scalar(select(Room.capacity).where(Room.id == room_id))
+    if capacity is not None:
+        _capacities.set(room_id, capacity, generation=generation)
+    return capacity
+
+
+def invalidate_room(room_id: int):
+    """Drop a room from the cache after it was updated or deleted."""
+    _capacities.pop(room_id)
+
+
+def clear_room_cache():
+    """Drop every cached room."""
+    _capacities.clear()
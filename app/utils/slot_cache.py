@@ -0,0 +1,32 @@
+from app.utils.ttl_cache import TTLCache
+
+SLOT_CACHE_SIZE = 1024
+# Only this process's booking writes clear the cache, so entries expire
+# quickly to bound how long a booking made elsewhere goes unnoticed
+SLOT_CACHE_TTL = 5  # seconds
+
+# (room_id, date, duration) -> available slots
+_slots = TTLCache(maxsize=SLOT_CACHE_SIZE, ttl=SLOT_CACHE_TTL)
+
+
+def get_cached_slots(key: tuple):
+    """Return the cached available slots for a key, or None on a miss."""
+    return _slots.get(key)
+
+
+def slot_cache_generation():
+    """Return the generation to pass to cache_slots, read before querying."""
+    return _slots.generation
+
+
+def cache_slots(key: tuple, slots: list, generation: int):
+    """
+    Store available slots for a key for SLOT_CACHE_TTL seconds, unless the
+    cache was cleared since generation was read and the slots may be stale.
+    """
+    _slots.set(key, slots, generation=generation)
+
+
+def clear_slot_cache():
+    """Drop every cached slot list, called whenever bookings change."""
+    _slots.clear()
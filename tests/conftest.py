@@ -0,0 +1,187 @@
+from itertools import count
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, sessionmaker, raiseload
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db import Base, get_db
+from app.models.user import User
+from app.utils.auth import (
+    create_access_token,
+    current_user_cache,
+    get_password_hash,
+    pwd_context,
+)
+from app.utils.room_cache import clear_room_cache
+from app.utils.slot_cache import clear_slot_cache
+
+# Test database setup. The database lives in memory, so tests never touch
+# the disk; StaticPool hands every session the one connection that holds it.
+SQLALCHEMY_DATABASE_URL = "sqlite://"
+
+# Every test user logs in with the same password
+TEST_PASSWORD = "testpassword"
+
+# bcrypt's cost doubles with each round; the tests only need hashes that
+# verify, so use the minimum instead of the production work factor
+pwd_context.update(bcrypt__rounds=4)
+
+
+# pysqlite opens and ends transactions behind SQLAlchemy's back, which breaks
+# the SAVEPOINTs used to roll tests back; let SQLAlchemy emit BEGIN instead.
+# Foreign keys are enforced as in app.db.set_sqlite_pragmas.
+def configure_test_connection(dbapi_connection, _):
+    dbapi_connection.isolation_level = None
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Sessions are bound per test to the connection clear_db opens. Their
+# commits only release a SAVEPOINT inside that connection's transaction.
+TestingSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    join_transaction_mode="create_savepoint",
+)
+
+
+@event.listens_for(TestingSessionLocal, "do_orm_execute")
+def raise_on_lazy_load(orm_execute_state):
+    """Make unplanned relationship lazy loads raise, so N+1 paths fail tests"""
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.is_column_load
+        or orm_execute_state.is_relationship_load
+    ):
+        return
+    # Wildcard loader options only apply to statements selecting one entity
+    columns = orm_execute_state.statement.column_descriptions
+    if len(columns) == 1 and columns[0]["expr"] is columns[0]["entity"]:
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*")
+        )
+
+
+# Dependency override
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db
+
+
+# Fixtures
+@pytest.fixture(scope="session")
+def engine():
+    """Create the test database and its tables once for the whole run"""
+    test_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    event.listen(test_engine, "connect", configure_test_connection)
+    event.listen(test_engine, "begin", emit_begin)
+    Base.metadata.create_all(bind=test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Provide one test client for the app, shared by the whole run"""
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_db(engine): # pylint: disable=redefined-outer-name
+    """Run each test in a transaction that is rolled back afterwards"""
+    connection = engine.connect()
+    trans = connection.begin()
+    TestingSessionLocal.configure(bind=connection)
+    yield
+    trans.rollback()
+    connection.close()
+    clear_room_cache()
+    clear_slot_cache()
+    current_user_cache.clear()
+
+
+@pytest.fixture
+def test_db():
+    """Provide a database session for testing"""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def test_password_hash():
+    """Hash the shared test password once; bcrypt is slow on purpose"""
+    return get_password_hash(TEST_PASSWORD)
+
+
+user_numbers = count(1)
+
+
+def get_next_user():
+    """Helper function to generate unique usernames"""
+    return next(user_numbers)
+
+
+@pytest.fixture(scope="session")
+def test_user_data():
+    """Fixture for test user data with unique username"""
+    username = get_next_user()
+    return {
+        "username": f"user_{username}",
+        "email": f"user_{username}@example.com",
+        "password": TEST_PASSWORD,
+    }
+
+
+@pytest.fixture
+def test_user(test_db): # pylint: disable=redefined-outer-name
+    """Fixture to create a test user in the database"""
+    username = get_next_user()
+    user_data = {
+        "username": f"user_{username}",
+        "email": f"user_{username}@example.com",
+        "hashed_password": "testpassword",
+    }
+
+    db_user = test_db.scalars(insert(User).values(**user_data).returning(User)).one()
+    test_db.commit()
+    return db_user
+
+
+@pytest.fixture(scope="session")
+# pylint: disable-next=redefined-outer-name
+def auth_headers(engine, test_user_data, test_password_hash):
+    """
+    Fixture to get authentication headers. The user is committed outside
+    the per-test transactions, so one user and token serve the whole run.
+    """
+    with Session(engine) as db:
+        db.add(
+            User(
+                username=test_user_data["username"],
+                email=test_user_data["email"],
+                hashed_password=test_password_hash,
+            )
+        )
+        db.commit()
+
+    token = create_access_token({"sub": test_user_data["username"]})
+    return {"Authorization": f"Bearer {token}"}
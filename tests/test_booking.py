@@ -2,27 +2,20 @@ import pytest
 from datetime import datetime, timedelta, date
 from fastapi import status
 from sqlalchemy.orm import Session
-from sqlalchemy import String, DateTime
+from sqlalchemy import String, DateTime, delete, insert, select
 from dataclasses import dataclass
+from types import MappingProxyType
 
-from app.models.booking import Booking
+from app.models.booking import Booking, slot_id_for
 from app.models.room import Room
 from app.models.user import User
+from app.utils.room_cache import get_room_capacity
 from app.schemas.booking import (
     BookingCreate,
     BookingUpdate,
     BookingOptimizeRequest,
 )
 
-from tests.conf_tests import (
-    client,
-    clear_db,
-    test_db,
-    test_user_data,
-    test_user,
-    auth_headers,
-)
-
 # Test data
 TEST_ROOM_DATA = {"name": "Test Room", "capacity": 10, "location": "Floor 1"}
 
@@ -53,57 +46,60 @@ TEST_OPTIMIZE_DATA = BookingInfo(
     required_capacity=5,
 )
 
+# Request payloads are built from these instead of re-serializing per test.
+# The template is read-only so no test can change it under the others.
+BOOKING_START_ISO = TEST_BOOKING_DATA.start_time.isoformat()
+OPTIMIZE_START_ISO = TEST_OPTIMIZE_DATA.start_time.isoformat()
+CREATE_BOOKING_TEMPLATE = MappingProxyType(
+    {
+        "start_time": BOOKING_START_ISO,
+        "purpose": TEST_BOOKING_DATA.purpose,
+        "required_capacity": TEST_BOOKING_DATA.required_capacity,
+    }
+)
+
 
 # Fixtures
 @pytest.fixture
 def test_room(test_db): # pylint: disable=redefined-outer-name
-    room = Room(**TEST_ROOM_DATA)
-    test_db.add(room)
+    room = test_db.scalars(insert(Room).values(**TEST_ROOM_DATA).returning(Room)).one()
     test_db.commit()
-    test_db.refresh(room)
     return room
 
 
 @pytest.fixture
 def test_booking(test_db, test_room, test_user): # pylint: disable=redefined-outer-name
-    booking = Booking(
-        room_id=test_room.id,
-        user_id=test_user.id,
-        start_time=TEST_BOOKING_DATA.start_time,
-        end_time=TEST_BOOKING_DATA.end_time,
-        purpose=TEST_BOOKING_DATA.purpose,
-    )
-    test_db.add(booking)
+    booking = test_db.scalars(
+        insert(Booking)
+        .values(
+            room_id=test_room.id,
+            user_id=test_user.id,
+            start_time=TEST_BOOKING_DATA.start_time,
+            end_time=TEST_BOOKING_DATA.end_time,
+            slot_id=slot_id_for(TEST_BOOKING_DATA.start_time),
+            purpose=TEST_BOOKING_DATA.purpose,
+        )
+        .returning(Booking)
+    ).one()
     test_db.commit()
-    test_db.refresh(booking)
     return booking
 
 
 # Tests
 # pylint: disable-next=redefined-outer-name
-def test_create_booking_success(auth_headers, test_room):
-    create_booking_data = {
-        "room_id": test_room.id,
-        "start_time": TEST_BOOKING_DATA.start_time.isoformat(),
-        "purpose": TEST_BOOKING_DATA.purpose,
-        "required_capacity": TEST_BOOKING_DATA.required_capacity,
-    }
+def test_create_booking_success(client, auth_headers, test_room):
+    create_booking_data = {**CREATE_BOOKING_TEMPLATE, "room_id": test_room.id}
     response = client.post("/bookings/", json=create_booking_data, headers=auth_headers)
     assert response.status_code == status.HTTP_201_CREATED
     data = response.json()
     assert data["room_id"] == test_room.id
     assert data["purpose"] == TEST_BOOKING_DATA.purpose
-    assert data["start_time"] == TEST_BOOKING_DATA.start_time.isoformat()
+    assert data["start_time"] == BOOKING_START_ISO
 
 
 # pylint: disable-next=redefined-outer-name
-def test_create_booking_unauthorized(test_room):
-    create_booking_data = {
-        "room_id": test_room.id,
-        "start_time": TEST_BOOKING_DATA.start_time.isoformat(),
-        "purpose": TEST_BOOKING_DATA.purpose,
-        "required_capacity": TEST_BOOKING_DATA.required_capacity,
-    }
+def test_create_booking_unauthorized(client, test_room):
+    create_booking_data = {**CREATE_BOOKING_TEMPLATE, "room_id": test_room.id}
     response = client.post("/bookings/", json=create_booking_data)
     assert response.status_code in [
         status.HTTP_401_UNAUTHORIZED,
@@ -111,7 +107,7 @@ def test_create_booking_unauthorized(test_room):
     ]
 
 # pylint: disable-next=redefined-outer-name
-def test_create_booking_invalid_time(auth_headers, test_room):
+def test_create_booking_invalid_time(client, auth_headers, test_room):
     create_booking_data = {
         "room_id": test_room.id,
         "start_time": datetime.now()
@@ -128,10 +124,10 @@ def test_create_booking_invalid_time(auth_headers, test_room):
     )
 
 # pylint: disable-next=redefined-outer-name
-def test_create_booking_room_not_found(auth_headers):
+def test_create_booking_room_not_found(client, auth_headers):
     create_booking_data = {
         "room_id": 999,
-        "start_time": TEST_BOOKING_DATA.start_time.isoformat(),
+        "start_time": BOOKING_START_ISO,
         "purpose": TEST_BOOKING_DATA.purpose,
         "required_capacity": TEST_BOOKING_DATA.required_capacity,
     }
@@ -139,10 +135,25 @@ def test_create_booking_room_not_found(auth_headers):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 # pylint: disable-next=redefined-outer-name
-def test_create_booking_insufficient_capacity(auth_headers, test_room):
+def test_create_booking_room_deleted_after_cached(
+    client, auth_headers, test_room, test_db
+):
+    # Warm the capacity cache, then drop the room without invalidating it so
+    # only the bookings foreign key can reject the insert
+    assert get_room_capacity(test_db, test_room.id) == test_room.capacity
+    test_db.execute(delete(Room).where(Room.id == test_room.id))
+    test_db.commit()
+
+    create_booking_data = {**CREATE_BOOKING_TEMPLATE, "room_id": test_room.id}
+    response = client.post("/bookings/", json=create_booking_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Room not found"
+
+# pylint: disable-next=redefined-outer-name
+def test_create_booking_insufficient_capacity(client, auth_headers, test_room):
     create_booking_data = {
         "room_id": test_room.id,
-        "start_time": TEST_BOOKING_DATA.start_time.isoformat(),
+        "start_time": BOOKING_START_ISO,
         "purpose": TEST_BOOKING_DATA.purpose,
         "required_capacity": 20,  # More than test room capacity
     }
@@ -151,7 +162,25 @@ def test_create_booking_insufficient_capacity(auth_headers, test_room):
     assert "capacity insufficient" in response.json()["detail"]
 
 # pylint: disable-next=redefined-outer-name
-def test_create_booking_overlapping(auth_headers, test_room, test_booking):
+def test_create_booking_sees_room_capacity_update(client, auth_headers, test_room):
+    create_booking_data = {**CREATE_BOOKING_TEMPLATE, "room_id": test_room.id}
+    # Warm the room cache, then shrink the room below the required capacity
+    response = client.get(
+        f"/bookings/available_slots/?room_id={test_room.id}&date={date.today()}",
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.put(
+        f"/rooms/{test_room.id}", json={"capacity": 5}, headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.post("/bookings/", json=create_booking_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "capacity insufficient" in response.json()["detail"]
+
+# pylint: disable-next=redefined-outer-name
+def test_create_booking_overlapping(client, auth_headers, test_room, test_booking):
     create_booking_data = {
         "room_id": test_room.id,
         "start_time": test_booking.start_time.isoformat(),  # Same time as existing booking
@@ -163,7 +192,7 @@ def test_create_booking_overlapping(auth_headers, test_room, test_booking):
     assert "already booked" in response.json()["detail"]
 
 # pylint: disable-next=redefined-outer-name
-def test_get_bookings(test_booking):
+def test_get_bookings(client, test_booking):
     response = client.get("/bookings/")
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -171,19 +200,19 @@ def test_get_bookings(test_booking):
     assert data[0]["id"] == test_booking.id
 
 # pylint: disable-next=redefined-outer-name
-def test_get_booking(test_booking):
+def test_get_booking(client, test_booking):
     response = client.get(f"/bookings/{test_booking.id}")
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert data["id"] == test_booking.id
 
 
-def test_get_booking_not_found():
+def test_get_booking_not_found(client):
     response = client.get("/bookings/999")
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 # pylint: disable-next=redefined-outer-name
-def test_update_booking_unauthorized(test_booking):
+def test_update_booking_unauthorized(client, test_booking):
     response = client.put(
         f"/bookings/{test_booking.id}", json={"purpose": "Should Fail"}
     )
@@ -193,10 +222,44 @@ def test_update_booking_unauthorized(test_booking):
     ]
 
 # pylint: disable-next=redefined-outer-name
-def test_optimize_booking_success(auth_headers, test_room):
+def test_update_booking_to_booked_slot(client, auth_headers, test_room):
+    booking_ids = []
+    for start_time in (TEST_BOOKING_DATA.start_time, TEST_OPTIMIZE_DATA.start_time):
+        create_booking_data = {
+            "room_id": test_room.id,
+            "start_time": start_time.isoformat(),
+            "purpose": TEST_BOOKING_DATA.purpose,
+            "required_capacity": TEST_BOOKING_DATA.required_capacity,
+        }
+        response = client.post(
+            "/bookings/", json=create_booking_data, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        booking_ids.append(response.json()["id"])
+
+    response = client.put(
+        f"/bookings/{booking_ids[0]}",
+        json={"start_time": OPTIMIZE_START_ISO},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "already booked" in response.json()["detail"]
+
+    response = client.put(
+        f"/bookings/{booking_ids[0]}",
+        json={"purpose": "Moved Meeting"},
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["start_time"] == BOOKING_START_ISO
+    assert data["purpose"] == "Moved Meeting"
+
+# pylint: disable-next=redefined-outer-name
+def test_optimize_booking_success(client, auth_headers, test_room):
     optimize_request = {
         "room_id": test_room.id,
-        "start_time": TEST_OPTIMIZE_DATA.start_time.isoformat(),
+        "start_time": OPTIMIZE_START_ISO,
         "purpose": TEST_OPTIMIZE_DATA.purpose,
         "required_capacity": TEST_OPTIMIZE_DATA.required_capacity,
     }
@@ -209,7 +272,7 @@ def test_optimize_booking_success(auth_headers, test_room):
     assert data["purpose"] == TEST_OPTIMIZE_DATA.purpose
 
 # pylint: disable-next=redefined-outer-name
-def test_get_available_slots(auth_headers, test_room):
+def test_get_available_slots(client, auth_headers, test_room):
     test_date = date.today()
     response = client.get(
         f"/bookings/available_slots/?room_id={test_room.id}&date={test_date}",
@@ -221,3 +284,116 @@ def test_get_available_slots(auth_headers, test_room):
     if slots:
         assert "start_time" in slots[0]
         assert "end_time" in slots[0]
+
+# pylint: disable-next=redefined-outer-name
+def test_get_available_slots_around_booking(client, auth_headers, test_room):
+    test_date = date.today() + timedelta(days=1)
+    day_start = datetime.combine(test_date, datetime.min.time())
+    create_booking_data = {
+        **CREATE_BOOKING_TEMPLATE,
+        "room_id": test_room.id,
+        "start_time": (day_start + timedelta(hours=12)).isoformat(),
+    }
+    response = client.post("/bookings/", json=create_booking_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get(
+        f"/bookings/available_slots/?room_id={test_room.id}&date={test_date}"
+        "&duration=90",
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    expected_starts = [
+        day_start + timedelta(hours=hours) for hours in (8, 9.5, 13, 14.5, 16)
+    ]
+    assert response.json() == [
+        {
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=90)).isoformat(),
+        }
+        for start in expected_starts
+    ]
+
+# pylint: disable-next=redefined-outer-name
+def test_get_available_slots_after_new_booking(client, auth_headers, test_room):
+    test_date = date.today() + timedelta(days=1)
+    booked_start = datetime.combine(test_date, datetime.min.time()) + timedelta(
+        hours=10
+    )
+    slots_url = f"/bookings/available_slots/?room_id={test_room.id}&date={test_date}"
+
+    response = client.get(slots_url, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert booked_start.isoformat() in [slot["start_time"] for slot in response.json()]
+
+    create_booking_data = {
+        "room_id": test_room.id,
+        "start_time": booked_start.isoformat(),
+        "purpose": TEST_BOOKING_DATA.purpose,
+        "required_capacity": TEST_BOOKING_DATA.required_capacity,
+    }
+    response = client.post("/bookings/", json=create_booking_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get(slots_url, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert booked_start.isoformat() not in [
+        slot["start_time"] for slot in response.json()
+    ]
+
+# pylint: disable-next=redefined-outer-name
+def test_bulk_create_bookings(client, auth_headers, test_room):
+    start_times = [
+        TEST_BOOKING_DATA.start_time + timedelta(days=1, hours=offset)
+        for offset in range(3)
+    ]
+    bulk_data = [
+        {
+            "room_id": test_room.id,
+            "start_time": start_time.isoformat(),
+            "purpose": TEST_BOOKING_DATA.purpose,
+            "required_capacity": TEST_BOOKING_DATA.required_capacity,
+        }
+        for start_time in start_times
+    ]
+    response = client.post("/bookings/bulk", json=bulk_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert [item["start_time"] for item in data] == [
+        start_time.isoformat() for start_time in start_times
+    ]
+    assert all(item["room_id"] == test_room.id for item in data)
+
+# pylint: disable-next=redefined-outer-name
+def test_bulk_create_bookings_conflict_in_batch(
+    client, auth_headers, test_room, test_db
+):
+    booking_data = {**CREATE_BOOKING_TEMPLATE, "room_id": test_room.id}
+    response = client.post(
+        "/bookings/bulk", json=[booking_data, booking_data], headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "already booked" in response.json()["detail"]
+    assert test_db.query(Booking).count() == 0
+
+
+# pylint: disable-next=redefined-outer-name
+def test_bulk_create_bookings_conflict_with_existing(
+    client, auth_headers, test_room, test_db
+):
+    booking_data = {**CREATE_BOOKING_TEMPLATE, "room_id": test_room.id}
+    response = client.post("/bookings/", json=booking_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    next_hour_data = {
+        **booking_data,
+        "start_time": (TEST_BOOKING_DATA.start_time + timedelta(hours=1)).isoformat(),
+    }
+    response = client.post(
+        "/bookings/bulk", json=[next_hour_data, booking_data], headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "already booked" in response.json()["detail"]
+    assert test_db.scalars(select(Booking.start_time)).all() == [
+        TEST_BOOKING_DATA.start_time
+    ]
@@ -1,20 +1,24 @@
+import jwt
 import pytest
 from fastapi import status
+from sqlalchemy import insert
 from app.models.room import Room
-from tests.conf_tests import client, clear_db, test_user_data, test_db, auth_headers
+from app.utils.auth import SECRET_KEY_BYTES, ALGORITHM
 
 
 @pytest.fixture
 def test_room(test_db): # pylint: disable=redefined-outer-name
-    room = Room(name="Conference Room A", capacity=10, location="Floor 1")
-    test_db.add(room)
+    room = test_db.scalars(
+        insert(Room)
+        .values(name="Conference Room A", capacity=10, location="Floor 1")
+        .returning(Room)
+    ).one()
     test_db.commit()
-    test_db.refresh(room)
     return room
 
 
 # Tests
-def test_create_room_unauthorized():
+def test_create_room_unauthorized(client):
     response = client.post(
         "/rooms/", json={"name": "Meeting Room", "capacity": 5, "location": "Floor 2"}
     )
@@ -24,13 +28,25 @@ def test_create_room_unauthorized():
     ]
 
 # pylint: disable-next=redefined-outer-name
-def test_create_room_success(auth_headers):
+def test_create_room_token_without_exp(client, auth_headers, test_user_data):
+    token = jwt.encode(
+        {"sub": test_user_data["username"]}, SECRET_KEY_BYTES, algorithm=ALGORITHM
+    )
+    response = client.post(
+        "/rooms/",
+        json={"name": "Meeting Room", "capacity": 5, "location": "Floor 2"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+# pylint: disable-next=redefined-outer-name
+def test_create_room_success(client, auth_headers):
     room_data = {"name": "Meeting Room", "capacity": 5, "location": "Floor 2"}
     response = client.post("/rooms/", json=room_data, headers=auth_headers)
     assert response.status_code == status.HTTP_201_CREATED
 
 # pylint: disable-next=redefined-outer-name
-def test_get_rooms_with_data(test_room):
+def test_get_rooms_with_data(client, test_room):
     response = client.get("/rooms/")
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -39,7 +55,7 @@ def test_get_rooms_with_data(test_room):
     assert data[0]["name"] == test_room.name
 
 # pylint: disable-next=redefined-outer-name
-def test_get_room_success(test_room):
+def test_get_room_success(client, test_room):
     response = client.get(f"/rooms/{test_room.id}")
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -48,14 +64,14 @@ def test_get_room_success(test_room):
     assert data["location"] == test_room.location
 
 
-def test_get_room_not_found():
+def test_get_room_not_found(client):
     response = client.get("/rooms/9999")
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json()["detail"] == "Room not found"
 
 
 # pylint: disable-next=redefined-outer-name
-def test_update_room_unauthorized(test_room):
+def test_update_room_unauthorized(client, test_room):
     response = client.put(f"/rooms/{test_room.id}", json={"name": "Updated Name"})
     assert response.status_code in [
         status.HTTP_401_UNAUTHORIZED,
@@ -63,7 +79,7 @@ def test_update_room_unauthorized(test_room):
     ]
 
 # pylint: disable-next=redefined-outer-name
-def test_update_room_success(auth_headers, test_room):
+def test_update_room_success(client, auth_headers, test_room):
     update_data = {
         "name": "Updated Conference Room",
         "capacity": 15,
@@ -79,7 +95,7 @@ def test_update_room_success(auth_headers, test_room):
     assert data["location"] == update_data["location"]
 
 # pylint: disable-next=redefined-outer-name
-def test_partial_update_room(auth_headers, test_room):
+def test_partial_update_room(client, auth_headers, test_room):
     update_data = {"capacity": 20}
     response = client.put(
         f"/rooms/{test_room.id}", json=update_data, headers=auth_headers
@@ -91,14 +107,14 @@ def test_partial_update_room(auth_headers, test_room):
     assert data["location"] == test_room.location
 
 # pylint: disable-next=redefined-outer-name
-def test_update_room_not_found(auth_headers):
+def test_update_room_not_found(client, auth_headers):
     response = client.put(
         "/rooms/9999", json={"name": "Non-existent Room"}, headers=auth_headers
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 # pylint: disable-next=redefined-outer-name
-def test_delete_room_unauthorized(test_room):
+def test_delete_room_unauthorized(client, test_room):
     response = client.delete(f"/rooms/{test_room.id}")
     assert response.status_code in [
         status.HTTP_401_UNAUTHORIZED,
@@ -106,13 +122,13 @@ def test_delete_room_unauthorized(test_room):
     ]
 
 # pylint: disable-next=redefined-outer-name
-def test_delete_room_success(auth_headers, test_room, test_db):
+def test_delete_room_success(client, auth_headers, test_room, test_db):
     response = client.delete(f"/rooms/{test_room.id}", headers=auth_headers)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     deleted_room = test_db.query(Room).filter(Room.id == test_room.id).first()
     assert deleted_room is None
 
 # pylint: disable-next=redefined-outer-name
-def test_delete_room_not_found(auth_headers):
+def test_delete_room_not_found(client, auth_headers):
     response = client.delete("/rooms/9999", headers=auth_headers)
     assert response.status_code == status.HTTP_404_NOT_FOUND